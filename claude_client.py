@@ -1,61 +1,153 @@
-"""Shared Anthropic API client with retry logic and JSON extraction."""
+"""Shared Anthropic API client with retry logic and structured (tool-use) output."""
 
-import json
-import time
+import threading
 
 import anthropic
+import httpx
 
 import config
 
-# Singleton client instance
+# Singleton client instance (shared by worker threads)
 _client = None
+_client_lock = threading.Lock()
+
+
+def _http_client() -> httpx.Client:
+    """
+    HTTP client shared by all Claude calls.
+
+    Keeps a pool of keep-alive connections sized for the worker threads, and uses
+    HTTP/2 (many in-flight requests over one TLS connection) when h2 is installed.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return anthropic.DefaultHttpxClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+    )
 
 
 def get_client() -> anthropic.Anthropic:
     """Return a shared Anthropic client instance."""
     global _client
-    if _client is None:
-        _client = anthropic.Anthropic(api_key=config.ANTHROPIC_API_KEY)
+    with _client_lock:
+        if _client is None:
+            # The SDK retries 408/409/429/5xx and connection errors with exponential
+            # backoff + jitter, honoring the Retry-After header
+            _client = anthropic.Anthropic(
+                api_key=config.ANTHROPIC_API_KEY,
+                max_retries=config.CLAUDE_MAX_RETRIES,
+                http_client=_http_client(),
+            )
     return _client
 
 
-def extract_json(text: str) -> dict:
-    """Extract JSON from a Claude response, handling markdown code blocks."""
-    if "```json" in text:
-        text = text.split("```json")[1].split("```")[0].strip()
-    elif "```" in text:
-        text = text.split("```")[1].split("```")[0].strip()
-    return json.loads(text)
+def _build_content(prompt: str, cached_prefix: str = None):
+    """Build message content, marking a stable prefix for Anthropic prompt caching."""
+    if not cached_prefix:
+        return prompt
+    return [
+        {"type": "text", "text": cached_prefix, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": prompt},
+    ]
 
 
-def call_claude(prompt: str, max_tokens: int = 1024) -> str:
+def _build_request(
+    prompt: str,
+    max_tokens: int,
+    cached_prefix: str = None,
+    system: str = None,
+    model: str = None,
+) -> dict:
     """
-    Call Claude API with automatic retry on failure.
+    Build Messages API request arguments (for `model`, default config.MODEL).
 
-    Returns the raw response text (caller handles parsing).
-    Retries once with 5s backoff on API errors.
+    `system` (static instructions) and `cached_prefix` (stable leading user text,
+    e.g. the resume) are both marked with cache_control, so calls that share them
+    are billed at the cache-hit rate. Put only per-call text in `prompt`.
     """
-    client = get_client()
+    request = {
+        "model": model or config.MODEL,
+        "max_tokens": max_tokens,
+        "messages": [{"role": "user", "content": _build_content(prompt, cached_prefix)}],
+    }
+    if system:
+        request["system"] = [
+            {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}},
+        ]
+    return request
 
-    try:
-        response = client.messages.create(
-            model=config.MODEL,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return response.content[0].text.strip()
-    except anthropic.APIError as e:
-        print(f"  Claude API error, retrying in 5s: {e}")
-        time.sleep(5)
-        response = client.messages.create(
-            model=config.MODEL,
-            max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return response.content[0].text.strip()
-
-
-def call_claude_json(prompt: str, max_tokens: int = 1024) -> dict:
-    """Call Claude API and parse the response as JSON."""
-    text = call_claude(prompt, max_tokens)
-    return extract_json(text)
+
+def _tool_input(message, tool: dict) -> dict:
+    """Return the input of the forced tool call in a response."""
+    for block in message.content:
+        if block.type == "tool_use":
+            return block.input
+    raise ValueError(f"Claude did not call the {tool['name']} tool")
+
+
+def _stream_tool_input(request: dict, tool: dict, stop_when) -> dict:
+    """Stream a tool call, returning early once `stop_when` accepts the partial input."""
+    partial_json = ""
+    with get_client().messages.stream(**request) as stream:
+        for event in stream:
+            if event.type == "input_json":
+                partial_json += event.partial_json
+                early = stop_when(partial_json)
+                if early is not None:
+                    # Leaving the block closes the connection; the rest isn't generated
+                    return early
+        return _tool_input(stream.get_final_message(), tool)
+
+
+def call_claude_tool(
+    prompt: str,
+    tool: dict,
+    max_tokens: int = 1024,
+    cached_prefix: str = None,
+    system: str = None,
+    stop_when=None,
+    model: str = None,
+) -> dict:
+    """
+    Call Claude API with a forced tool call and return the tool input.
+
+    The tool's input_schema describes the expected JSON, so the SDK hands back an
+    already-parsed dict — no fence stripping or json parsing of response text.
+
+    If `stop_when` is given, the response is streamed and `stop_when(partial_json)`
+    is called as the tool input arrives. When it returns a dict, the stream is
+    closed and that dict is returned without waiting for the rest of the completion.
+
+    See _build_request for prompt caching; transient errors are retried by the SDK.
+    """
+    request = _build_request(prompt, max_tokens, cached_prefix, system, model)
+    request["tools"] = [tool]
+    request["tool_choice"] = {"type": "tool", "name": tool["name"]}
+
+    if stop_when is None:
+        response = get_client().messages.create(**request)
+        return _tool_input(response, tool)
+    return _stream_tool_input(request, tool, stop_when)
+
+
+def call_claude_tool_cascade(request: dict, needs_escalation) -> dict:
+    """
+    call_claude_tool(**request) on FAST_MODEL first, redone on MODEL if
+    `needs_escalation(result)` is true or the fast call fails.
+
+    The cascade only saves cost, so a fast-model error never fails the request on
+    its own. Without FAST_MODEL this is a single MODEL call.
+    """
+    if config.FAST_MODEL:
+        try:
+            result = call_claude_tool(**request, model=config.FAST_MODEL)
+        except Exception:
+            pass  # escalate
+        else:
+            if not needs_escalation(result):
+                return result
+    return call_claude_tool(**request)
@@ -1,17 +1,33 @@
 """Configuration for Job Search Intelligence Tool."""
 
 import os
+from pathlib import Path
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY", "")  # Optional: free tier at serpapi.com (100 searches/month)
-RESUME_PATH = os.path.join(os.path.dirname(__file__), "resume", "Peter_Pandey_Data_Engineer_Resume.pdf")
-TRACKER_PATH = os.path.join(os.path.dirname(__file__), "tracker", "my_job_application_tracker.xlsx")
-PARSED_RESUME_CACHE = os.path.join(os.path.dirname(__file__), "resume", ".parsed_resume.json")
+BASE_DIR = Path(__file__).parent
+RESUME_PATH = str(BASE_DIR / "resume" / "Peter_Pandey_Data_Engineer_Resume.pdf")
+TRACKER_PATH = str(BASE_DIR / "tracker" / "my_job_application_tracker.xlsx")
+PARSED_RESUME_CACHE = str(BASE_DIR / "resume" / ".parsed_resume.pkl")
+CACHE_DIR = str(Path.home() / ".cache" / "jobsearch")  # cached Claude responses
 
 MODEL = "claude-sonnet-4-5-20250929"
+FAST_MODEL = "claude-haiku-4-5-20251001"  # first-pass scoring/messages; escalated to MODEL when borderline ("" = MODEL only)
+MATCH_ESCALATE_RANGE = (45, 75)  # fast-model match % in this range (inclusive) is re-scored with MODEL
+CLAUDE_MAX_RETRIES = 5  # SDK retries for transient Claude API errors (backoff + jitter, honors Retry-After)
 GOOGLE_SEARCH_PAUSE = 5  # seconds between Google searches
-API_CALL_DELAY = 2  # seconds between Claude API calls
+REFERRAL_CACHE_TTL = 24 * 60 * 60  # seconds to reuse cached profile search results
+MAX_CONCURRENT_JOBS = 4  # tracker rows processed in parallel (keeps Claude rate limits in check)
+JD_BATCH_SIZE = 8  # job descriptions parsed (and scored) per Claude API call; <= 20 so max_tokens needs no streaming
+MATCH_BATCH_MAX_CHARS = 300_000  # JD text per batched scoring call, well inside the context window
+PREFILTER_MIN_SIMILARITY = 0  # TF-IDF resume/JD similarity below which Claude is skipped, e.g. 0.08 (needs scikit-learn; 0 = off)
+MIN_MATCH_PCT = 0  # jobs scoring below this skip improvements + messages (0 = never skip)
+FUSE_MATCH_AND_MESSAGES = True  # score + write messages in one Claude call per job (False: batched scoring + a message call per job)
 GOOGLE_RATE_LIMIT_WAIT = 30  # seconds to wait if rate limited
+TRACKER_FLUSH_EVERY = 1  # save the tracker after this many processed rows
+PDF_TEXT_BACKEND = "pymupdf"  # "pymupdf" (falls back to pdfplumber if not installed) or "pdfplumber"
+TRACKER_CREATE_BACKEND = "xlsxwriter"  # "xlsxwriter" (falls back to openpyxl if not installed) or "openpyxl"
@@ -1,9 +1,15 @@
 """Reads/writes the Excel tracker file using openpyxl."""
 
 import os
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Iterable
 
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import coordinate_to_tuple, get_column_letter, range_boundaries
 
 import config
 
@@ -38,57 +44,312 @@ GREEN_FILL = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="so
 YELLOW_FILL = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
 RED_FILL = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
 
+# Styles are immutable, so one shared instance can be assigned to any number of cells
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(wrap_text=True)
+WRAP_TOP = Alignment(wrap_text=True, vertical="top")
+
+# Tracker paths already confirmed to exist during this process
+_ensured_paths: set[str] = set()
+
+
+def _create_tracker_openpyxl(f) -> None:
+    """Write the header-only tracker with openpyxl's streaming write-only mode."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Job Tracker")
+
+    for col, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    header_cells = []
+    for header in EXPECTED_HEADERS.values():
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = HEADER_FONT
+        cell.alignment = HEADER_ALIGNMENT
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    wb.save(f)
+
+
+def _create_tracker_xlsxwriter(f) -> None:
+    """Write the header-only tracker with xlsxwriter (faster, create-only)."""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(f)
+    ws = workbook.add_worksheet("Job Tracker")
+    header_format = workbook.add_format({"bold": True, "text_wrap": True})
+
+    for col, width in COLUMN_WIDTHS.items():
+        ws.set_column(col - 1, col - 1, width)
+    for col, header in EXPECTED_HEADERS.items():
+        ws.write(0, col - 1, header, header_format)
+
+    workbook.close()
+
 
 def _ensure_tracker_exists(tracker_path: str) -> None:
     """Create the tracker file with headers if it doesn't exist."""
-    if os.path.exists(tracker_path):
+    if tracker_path in _ensured_paths:
         return
 
-    os.makedirs(os.path.dirname(tracker_path), exist_ok=True)
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Job Tracker"
-
-    header_font = Font(bold=True)
-    for col, header in EXPECTED_HEADERS.items():
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.alignment = Alignment(wrap_text=True)
+    path = Path(tracker_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # Exclusive create: one open() both checks for and claims the file
+        f = open(path, "xb")
+    except FileExistsError:
+        _ensured_paths.add(tracker_path)
+        return
 
-    for col, width in COLUMN_WIDTHS.items():
-        col_letter = ws.cell(row=1, column=col).column_letter
-        ws.column_dimensions[col_letter].width = width
+    try:
+        with f:
+            if config.TRACKER_CREATE_BACKEND == "xlsxwriter":
+                try:
+                    _create_tracker_xlsxwriter(f)
+                except ImportError:
+                    _create_tracker_openpyxl(f)
+            else:
+                _create_tracker_openpyxl(f)
+    except Exception:
+        path.unlink()
+        raise
 
-    wb.save(tracker_path)
+    _ensured_paths.add(tracker_path)
     print(f"Created new tracker file: {tracker_path}")
 
 
+def _replace_tracker(tmp_path: str, real_path: str) -> None:
+    """
+    Move a fully written temp file over the tracker, keeping its permissions.
+
+    `real_path` must be the symlink-resolved tracker path (and `tmp_path` beside
+    it), so a symlinked tracker is updated in place rather than replaced by a file.
+    """
+    shutil.copymode(real_path, tmp_path)
+    os.replace(tmp_path, real_path)
+
+
+def _needs_migration(header_b) -> bool:
+    """Return True if the Column B header is not 'JD Text'."""
+    return not (header_b and str(header_b).strip().lower() == "jd text")
+
+
 def _migrate_columns_if_needed(ws) -> bool:
     """
     Check if Column B is 'JD Text'. If not, insert it and shift data right.
     Returns True if migration was performed.
     """
-    header_b = ws.cell(row=1, column=2).value
-    if header_b and str(header_b).strip().lower() == "jd text":
+    if not _needs_migration(ws["B1"].value):
         return False
 
-    print("  Migrating Excel: inserting 'JD Text' column at B and shifting data right...")
     ws.insert_cols(2)
-    ws.cell(row=1, column=2, value="JD Text")
-    ws.cell(row=1, column=2).font = Font(bold=True)
-    ws.cell(row=1, column=2).alignment = Alignment(wrap_text=True)
+    header_cell = ws.cell(row=1, column=2, value="JD Text")
+    header_cell.font = HEADER_FONT
+    header_cell.alignment = HEADER_ALIGNMENT
     return True
 
 
-def _apply_formatting(ws) -> None:
-    """Apply column widths and text wrapping."""
+def _apply_formatting(ws, rows: Iterable[int] = ()) -> None:
+    """
+    Apply column widths and text wrapping.
+
+    Wrapping is set as the column default; cells in `rows` that already hold
+    values keep their own style, so those are also set explicitly.
+    """
     for col, width in COLUMN_WIDTHS.items():
-        col_letter = ws.cell(row=1, column=col).column_letter
-        ws.column_dimensions[col_letter].width = width
+        dimension = ws.column_dimensions[get_column_letter(col)]
+        dimension.width = width
+        dimension.alignment = WRAP_TOP
+
+    for row_number in rows:
+        for cell in next(ws.iter_rows(min_row=row_number, max_row=row_number, max_col=10)):
+            if cell.value is not None:
+                cell.alignment = WRAP_TOP
+
+
+def _iter_rows_openpyxl(tracker_path: str):
+    """Stream the first three columns of each row from a read-only workbook."""
+    wb = load_workbook(tracker_path, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(max_col=3, values_only=True)
+    finally:
+        wb.close()
+
+
+def _iter_rows_calamine(tracker_path: str):
+    """Read the first three columns of each row with python-calamine (Rust parser)."""
+    from python_calamine import CalamineWorkbook
+
+    # The active sheet, as everywhere else (openpyxl's wb.active), not the first one
+    workbook = CalamineWorkbook.from_path(tracker_path)
+    sheet = workbook.get_sheet_by_name(_active_sheet_name(tracker_path))
+    for row in sheet.to_python(skip_empty_area=False):
+        yield (tuple(row[:3]) + (None, None, None))[:3]
+
+
+def _iter_tracker_rows(tracker_path: str):
+    """
+    Yield (job_link, jd_text, match_pct) for every row, header row included.
+
+    Uses python-calamine when installed (much faster than openpyxl for reads),
+    otherwise openpyxl's streaming read-only mode.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return _iter_rows_openpyxl(tracker_path)
+    return _iter_rows_calamine(tracker_path)
+
+
+_SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
 
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=10):
-        for cell in row:
-            cell.alignment = Alignment(wrap_text=True, vertical="top")
+
+def _active_sheet_element(archive: zipfile.ZipFile):
+    """Return the workbook.xml <sheet> entry of the active tab (the one wb.active opens)."""
+    from lxml import etree
+
+    workbook = etree.fromstring(archive.read("xl/workbook.xml"))
+    view = workbook.find(f"{{{_SHEET_NS}}}bookViews/{{{_SHEET_NS}}}workbookView")
+    active_tab = int(view.get("activeTab", 0)) if view is not None else 0
+    return workbook.findall(f"{{{_SHEET_NS}}}sheets/{{{_SHEET_NS}}}sheet")[active_tab]
+
+
+def _active_sheet_name(tracker_path: str) -> str:
+    """Name of the tracker's active worksheet, read from workbook.xml when lxml is installed."""
+    try:
+        with zipfile.ZipFile(tracker_path) as archive:
+            return _active_sheet_element(archive).get("name")
+    except ImportError:
+        wb = load_workbook(tracker_path, read_only=True)
+        try:
+            return wb.active.title
+        finally:
+            wb.close()
+
+
+def _active_sheet_xml_path(archive: zipfile.ZipFile) -> str:
+    """Resolve the archive path of the workbook's active worksheet XML."""
+    from lxml import etree
+
+    rel_id = _active_sheet_element(archive).get(f"{{{_REL_NS}}}id")
+
+    rels = etree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for rel in rels.iter(f"{{{_PKG_REL_NS}}}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise ValueError(f"Worksheet relationship {rel_id} not found")
+
+
+def _insert_jd_column_xml(sheet_xml: bytes) -> bytes:
+    """
+    Shift every cell in column B onwards one column right and add the 'JD Text' header.
+
+    Works directly on the worksheet XML so no openpyxl Cell objects are built.
+    """
+    from lxml import etree
+
+    ns = f"{{{_SHEET_NS}}}"
+    root = etree.fromstring(sheet_xml)
+    sheet_data = root.find(f"{ns}sheetData")
+
+    for cell in sheet_data.iter(f"{ns}c"):
+        ref = cell.get("r")
+        if ref is None:
+            raise ValueError("Cell without a reference; cannot shift columns in XML")
+        row, col = coordinate_to_tuple(ref)
+        if col >= 2:
+            cell.set("r", f"{get_column_letter(col + 1)}{row}")
+
+    # Row spans and the dimension are optional hints; drop/refresh rather than recompute
+    for row in sheet_data.iter(f"{ns}row"):
+        row.attrib.pop("spans", None)
+    dimension = root.find(f"{ns}dimension")
+    if dimension is not None:
+        min_col, min_row, max_col, max_row = range_boundaries(dimension.get("ref"))
+        max_col = max_col + 1 if max_col >= 2 else max_col
+        dimension.set("ref", f"A1:{get_column_letter(max_col)}{max_row}")
+
+    # Header cell B1, styled like A1 (the bold header style in trackers we created)
+    header_row = next((r for r in sheet_data.iter(f"{ns}row") if r.get("r") == "1"), None)
+    if header_row is None:
+        header_row = etree.Element(f"{ns}row", r="1")
+        sheet_data.insert(0, header_row)
+    header = etree.Element(f"{ns}c", r="B1", t="inlineStr")
+    cell_a1 = next((c for c in header_row if c.get("r") == "A1"), None)
+    if cell_a1 is not None and cell_a1.get("s"):
+        header.set("s", cell_a1.get("s"))
+    etree.SubElement(etree.SubElement(header, f"{ns}is"), f"{ns}t").text = "JD Text"
+    header_row.insert(header_row.index(cell_a1) + 1 if cell_a1 is not None else 0, header)
+
+    # Column widths for the tracker columns; leave any user-defined columns past J alone
+    cols = root.find(f"{ns}cols")
+    if cols is None:
+        cols = etree.Element(f"{ns}cols")
+        sheet_data.addprevious(cols)
+    for col_def in list(cols):
+        if int(col_def.get("min")) <= len(COLUMN_WIDTHS):
+            cols.remove(col_def)
+    for col, width in sorted(COLUMN_WIDTHS.items(), reverse=True):
+        col_def = etree.Element(
+            f"{ns}col", min=str(col), max=str(col), width=str(width), customWidth="1"
+        )
+        cols.insert(0, col_def)
+
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _migrate_tracker_xml(tracker_path: str) -> None:
+    """Insert the 'JD Text' column by rewriting the worksheet XML inside the .xlsx archive."""
+    real_path = os.path.realpath(tracker_path)
+    tmp_path = real_path + ".tmp"
+    with zipfile.ZipFile(real_path) as archive:
+        if "xl/calcChain.xml" in archive.namelist():
+            raise ValueError("Workbook has a calculation chain; needs a full openpyxl rewrite")
+        sheet_path = _active_sheet_xml_path(archive)
+        sheet_xml = _insert_jd_column_xml(archive.read(sheet_path))
+
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+            for item in archive.infolist():
+                data = sheet_xml if item.filename == sheet_path else archive.read(item.filename)
+                out.writestr(item, data, compress_type=zipfile.ZIP_DEFLATED)
+    _replace_tracker(tmp_path, real_path)
+
+
+def _migrate_tracker_openpyxl(tracker_path: str) -> None:
+    """Load the tracker in full (write) mode, migrate its columns, and save."""
+    wb = load_workbook(tracker_path)
+    ws = wb.active
+    if _migrate_columns_if_needed(ws):
+        _apply_formatting(ws, rows=range(1, ws.max_row + 1))
+        wb.save(tracker_path)
+    wb.close()
+
+
+def _migrate_tracker(tracker_path: str) -> None:
+    """
+    Insert the 'JD Text' column at B and shift existing data right.
+
+    Rewrites the sheet XML directly when lxml is available (no Cell objects, so
+    fast on large trackers); otherwise falls back to openpyxl's insert_cols.
+    """
+    print("  Migrating Excel: inserting 'JD Text' column at B and shifting data right...")
+    try:
+        _migrate_tracker_xml(tracker_path)
+    except (ImportError, ValueError):
+        _migrate_tracker_openpyxl(tracker_path)
+    print(f"  Column migration complete. Saved to {tracker_path}")
+    print("  Please paste job description text into the new 'JD Text' column (B).")
+
+
+def _nonempty(value) -> bool:
+    """True if a cell value has content (a non-blank string or any other truthy value)."""
+    if isinstance(value, str):
+        return bool(value.strip())
+    return bool(value)
 
 
 def read_unprocessed_rows(tracker_path: str = None) -> list[tuple[int, str, str]]:
@@ -102,7 +363,9 @@ def read_unprocessed_rows(tracker_path: str = None) -> list[tuple[int, str, str]
 
     _ensure_tracker_exists(tracker_path)
 
-    # Early write-permission check — fail fast before expensive API calls
+    # Early write-permission check — fail fast before expensive API calls. This is the
+    # only access check: the scan below reads the file and doesn't need write access.
+    # (os.access can't see Excel's lock on Windows; opening for append can.)
     try:
         with open(tracker_path, "a"):
             pass
@@ -112,47 +375,43 @@ def read_unprocessed_rows(tracker_path: str = None) -> list[tuple[int, str, str]
             "Please close it and try again."
         )
 
-    try:
-        wb = load_workbook(tracker_path)
-    except PermissionError:
-        raise PermissionError(
-            f"Cannot open {tracker_path} — the file may be open in another application.\n"
-            "Please close it and try again."
-        )
-
-    ws = wb.active
+    rows = _iter_tracker_rows(tracker_path)
+    header = next(rows, ())
+    header_b = header[1] if len(header) > 1 else None
 
-    migrated = _migrate_columns_if_needed(ws)
-    if migrated:
-        _apply_formatting(ws)
-        wb.save(tracker_path)
-        print(f"  Column migration complete. Saved to {tracker_path}")
-        print("  Please paste job description text into the new 'JD Text' column (B).")
+    # Migration needs write mode — only pay for a full load when it's required
+    if _needs_migration(header_b):
+        rows.close()
+        _migrate_tracker(tracker_path)
+        rows = _iter_tracker_rows(tracker_path)
+        next(rows, None)
 
     unprocessed = []
-    for row in range(2, ws.max_row + 1):
-        job_link = ws.cell(row=row, column=1).value
-        jd_text = ws.cell(row=row, column=2).value
-        match_pct = ws.cell(row=row, column=3).value
-
-        if job_link and str(job_link).strip():
-            if jd_text and str(jd_text).strip():
-                if not match_pct or not str(match_pct).strip():
-                    unprocessed.append((row, str(job_link).strip(), str(jd_text).strip()))
-            else:
-                print(f"  Row {row}: JD text is empty, skipping. Paste the job description in Column B.")
+    for row, (job_link, jd_text, match_pct) in enumerate(rows, start=2):
+        # Most rows in a mature tracker are already processed — reject those first
+        if _nonempty(match_pct) or not _nonempty(job_link):
+            continue
+        if not _nonempty(jd_text):
+            print(f"  Row {row}: JD text is empty, skipping. Paste the job description in Column B.")
+            continue
+        unprocessed.append((row, str(job_link).strip(), str(jd_text).strip()))
 
-    wb.close()
     return unprocessed
 
 
 class TrackerWriter:
-    """Context manager that keeps the workbook open for batch writes."""
+    """
+    Context manager that keeps the workbook open for batch writes.
 
-    def __init__(self, tracker_path: str = None):
+    Saves every `flush_every` rows, and once more on exit for any rows still pending.
+    """
+
+    def __init__(self, tracker_path: str = None, flush_every: int = 1):
         self.tracker_path = tracker_path or config.TRACKER_PATH
+        self.flush_every = max(1, flush_every)
         self.wb = None
         self.ws = None
+        self._dirty_rows = 0
 
     def __enter__(self):
         try:
@@ -167,11 +426,21 @@ class TrackerWriter:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.wb:
+            if self._dirty_rows:
+                self.flush()
             self.wb.close()
         return False
 
+    def flush(self) -> None:
+        """Save pending rows via a temp file so an interrupted save can't corrupt the tracker."""
+        real_path = os.path.realpath(self.tracker_path)
+        tmp_path = real_path + ".tmp"
+        self.wb.save(tmp_path)
+        _replace_tracker(tmp_path, real_path)
+        self._dirty_rows = 0
+
     def write_results(self, row_number: int, results: dict) -> None:
-        """Write processing results to a row and save immediately."""
+        """Write processing results to a row, saving every `flush_every` rows."""
         ws = self.ws
 
         # Column C: Match %
@@ -210,8 +479,10 @@ class TrackerWriter:
                 ws.cell(row=row_number, column=msg_col, value="N/A")
 
         # Apply formatting to this row
-        for col in range(1, 11):
-            ws.cell(row=row_number, column=col).alignment = Alignment(wrap_text=True, vertical="top")
+        for cell in next(ws.iter_rows(min_row=row_number, max_row=row_number, max_col=10)):
+            cell.alignment = WRAP_TOP
 
-        # Save after each row so progress isn't lost
-        self.wb.save(self.tracker_path)
+        # Save periodically so progress isn't lost
+        self._dirty_rows += 1
+        if self._dirty_rows >= self.flush_every:
+            self.flush()
@@ -1,6 +1,126 @@
 """Extracts structured info from job description text using Claude API."""
 
 import claude_client
+import config
+import response_cache
+
+# Static instructions, sent as the cached system prompt
+_INSTRUCTIONS = """Extract structured information from each job description below. Submit it with the submit_jobs tool: one object per job description, in the same order."""
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+# Output schema; Claude is forced to call this tool, so its input is the result
+_PARSE_TOOL = {
+    "name": "submit_jobs",
+    "description": "Submit the structured fields for every job description, in order.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "jobs": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "job_title": {"type": "string"},
+                        "company_name": {"type": "string"},
+                        "location": {"type": "string"},
+                        "required_skills": _STRING_LIST,
+                        "preferred_skills": _STRING_LIST,
+                        "experience_required": {"type": "string"},
+                        "key_responsibilities": {**_STRING_LIST, "maxItems": 5},
+                        "domain": {
+                            "type": "string",
+                            "description": 'e.g. "Fintech", "HealthTech", "E-commerce"',
+                        },
+                    },
+                    "required": [
+                        "job_title", "company_name", "location", "required_skills",
+                        "preferred_skills", "experience_required", "key_responsibilities", "domain",
+                    ],
+                },
+            },
+        },
+        "required": ["jobs"],
+    },
+}
+
+_DEFAULTS = {
+    "job_title": "Unknown",
+    "company_name": "Unknown",
+    "location": "Unknown",
+    "required_skills": [],
+    "preferred_skills": [],
+    "experience_required": "Not specified",
+    "key_responsibilities": [],
+    "domain": "Unknown",
+}
+
+
+def _with_defaults(parsed: dict) -> dict:
+    """Ensure all expected fields exist."""
+    for key, default in _DEFAULTS.items():
+        if key not in parsed:
+            parsed[key] = default
+    return parsed
+
+
+def _parse_uncached(jd_texts: list[str]) -> list[dict]:
+    """Send job descriptions to Claude in one call and return the parsed dicts."""
+    jd_blocks = "\n\n".join(
+        f"JOB DESCRIPTION {i}:\n{jd_text}" for i, jd_text in enumerate(jd_texts, 1)
+    )
+    parsed = claude_client.call_claude_tool(
+        jd_blocks,
+        _PARSE_TOOL,
+        max_tokens=1024 * len(jd_texts),
+        system=_INSTRUCTIONS,
+    ).get("jobs")
+
+    if not isinstance(parsed, list) or len(parsed) != len(jd_texts):
+        raise ValueError(f"Expected {len(jd_texts)} parsed job description(s) from Claude")
+
+    return [_with_defaults(item if isinstance(item, dict) else {}) for item in parsed]
+
+
+def parse_jds(jd_texts: list[str]) -> list[dict]:
+    """
+    Parse several job descriptions in a single Claude API call.
+
+    Results are cached on disk by JD text, so only unseen JDs are sent to Claude,
+    JD_BATCH_SIZE per call. If a batch reply comes back short, its JDs are parsed
+    one per call; a JD that still fails raises ValueError after the rest are cached.
+    Returns one dict per JD, in order, with: job_title, company_name, location,
+    required_skills, preferred_skills, experience_required, key_responsibilities, domain.
+    """
+    keys = [response_cache.make_key(_INSTRUCTIONS, jd_text) for jd_text in jd_texts]
+    results = [response_cache.load("jd_parse", key) for key in keys]
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    # At most JD_BATCH_SIZE JDs per call, so max_tokens stays within what the SDK
+    # allows without streaming
+    for start in range(0, len(misses), config.JD_BATCH_SIZE):
+        batch = misses[start:start + config.JD_BATCH_SIZE]
+        try:
+            parsed = _parse_uncached([jd_texts[i] for i in batch])
+        except ValueError:
+            if len(batch) == 1:
+                raise
+            # A short or truncated reply shouldn't sink the whole batch: parse each JD
+            # on its own, caching the ones that succeed before raising any failure
+            error = None
+            for i in batch:
+                try:
+                    results[i] = parse_jd(jd_texts[i])
+                except ValueError as e:
+                    error = error or e
+            if error:
+                raise error
+            continue
+        for i, jd_data in zip(batch, parsed):
+            response_cache.store("jd_parse", keys[i], jd_data)
+            results[i] = jd_data
+
+    return results
 
 
 def parse_jd(jd_text: str) -> dict:
@@ -10,34 +130,4 @@ def parse_jd(jd_text: str) -> dict:
     Returns dict with: job_title, company_name, location, required_skills,
     preferred_skills, experience_required, key_responsibilities, domain.
     """
-    prompt = f"""Extract structured information from this job description. Return ONLY valid JSON with these fields:
-- job_title (string)
-- company_name (string)
-- location (string)
-- required_skills (array of strings)
-- preferred_skills (array of strings)
-- experience_required (string)
-- key_responsibilities (array of strings, max 5)
-- domain (string, e.g. "Fintech", "HealthTech", "E-commerce")
-
-Job Description:
-{jd_text}"""
-
-    parsed = claude_client.call_claude_json(prompt)
-
-    # Ensure all expected fields exist
-    defaults = {
-        "job_title": "Unknown",
-        "company_name": "Unknown",
-        "location": "Unknown",
-        "required_skills": [],
-        "preferred_skills": [],
-        "experience_required": "Not specified",
-        "key_responsibilities": [],
-        "domain": "Unknown",
-    }
-    for key, default in defaults.items():
-        if key not in parsed:
-            parsed[key] = default
-
-    return parsed
+    return parse_jds([jd_text])[0]
@@ -9,16 +9,74 @@ improvement areas, referral profiles, and contextual cold messages.
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import config
 import excel_handler
 import jd_parser
 import matcher
 import message_generator
+import orchestrator
 import referral_finder
 import resume_parser
 
 
+def _find_referrals(row_num: int, company_name: str, job_title: str) -> list[dict]:
+    """Find referral profiles (uses Google, not Claude)."""
+    referrals = referral_finder.find_referrals(company_name, job_title)
+    real_profiles = sum(1 for r in referrals if r["name"] != "Could not find profile")
+    print(f"  Row {row_num}: found {real_profiles} referral profile(s)")
+    return referrals
+
+
+def process_row(
+    row_num: int,
+    jd_text: str,
+    jd_data: dict,
+    resume_data: dict,
+    match_result: dict = None,
+) -> dict:
+    """
+    Score, find referrals, and write messages for one tracker row.
+
+    In two-call mode the score comes in as `match_result` (from the batched
+    matcher); in fused mode it is produced together with the messages.
+
+    Rows are independent, so this runs on a worker thread; the caller writes
+    the returned results to Excel.
+    """
+    job_title = jd_data.get("job_title", "Unknown")
+    company_name = jd_data.get("company_name", "Unknown")
+    print(f"  Row {row_num}: {job_title} at {company_name}")
+
+    referrals = _find_referrals(row_num, company_name, job_title)
+
+    if config.FUSE_MATCH_AND_MESSAGES:
+        # Score match % + write all messages in a single API call
+        job_result = orchestrator.process_job(resume_data, jd_data, jd_text, referrals)
+        match_pct = job_result["match_percentage"]
+        improvements = job_result["improvements"]
+        messages = job_result["messages"]
+    else:
+        match_pct = match_result["match_percentage"]
+        improvements = match_result["improvements"]
+
+        if config.MIN_MATCH_PCT and match_pct < config.MIN_MATCH_PCT:
+            messages = []
+        else:
+            # Generate all messages in a single API call
+            messages = message_generator.generate_messages(referrals, resume_data, jd_data)
+
+    print(f"  Row {row_num}: {match_pct}% match, generated {len(messages)} message(s)")
+
+    return {
+        "match_percentage": match_pct,
+        "improvements": improvements,
+        "referrals": referrals,
+        "messages": messages,
+    }
+
+
 def main():
     start_time = time.time()
 
@@ -65,57 +123,149 @@ def main():
         print(f"ERROR parsing resume: {e}")
         sys.exit(1)
 
-    # --- Step 3: Process each row ---
+    # --- Step 3: Parse job descriptions in batches (one API call per batch) ---
     succeeded = []
     failed = []
+    parsed_jds = {}
+
+    print("Parsing job descriptions...")
+    for start in range(0, len(unprocessed), config.JD_BATCH_SIZE):
+        batch = unprocessed[start:start + config.JD_BATCH_SIZE]
+        try:
+            jd_batch = jd_parser.parse_jds([jd_text for _, _, jd_text in batch])
+        except ValueError as e:
+            if len(batch) == 1:
+                print(f"  ERROR parsing job description: {e}")
+                failed.append((batch[0][0], f"JD parsing failed: {e}"))
+                continue
+            # Bad reply for some JD in the batch: retry row by row so only that row
+            # fails (the JDs that did parse are cache hits)
+            jd_batch = None
+        except Exception as e:
+            print(f"  ERROR parsing job descriptions: {e}")
+            failed.extend((row_num, f"JD parsing failed: {e}") for row_num, _, _ in batch)
+            continue
 
-    with excel_handler.TrackerWriter() as writer:
-        for row_num, job_link, jd_text in unprocessed:
-            print(f"Processing row {row_num}...")
+        if jd_batch is None:
+            for row_num, _, jd_text in batch:
+                try:
+                    parsed_jds[row_num] = jd_parser.parse_jd(jd_text)
+                except Exception as e:
+                    print(f"  ERROR parsing job description in row {row_num}: {e}")
+                    failed.append((row_num, f"JD parsing failed: {e}"))
+            continue
+        for (row_num, _, _), jd_data in zip(batch, jd_batch):
+            parsed_jds[row_num] = jd_data
+    print(f"  Parsed {len(parsed_jds)} job description(s)\n")
 
+    jobs = [(row_num, jd_text) for row_num, _, jd_text in unprocessed if row_num in parsed_jds]
+
+    # --- Step 3a: Optional local TF-IDF prefilter — clearly unrelated JDs skip Claude + search ---
+    prefiltered = {}
+    if config.PREFILTER_MIN_SIMILARITY and jobs:
+        similarities = matcher.tfidf_similarities(
+            resume_data.get("raw_text", ""), [jd_text for _, jd_text in jobs]
+        )
+        if similarities is None:
+            print("Prefilter skipped: scikit-learn is not installed\n")
+        else:
+            for (row_num, _), similarity in zip(jobs, similarities):
+                if similarity < config.PREFILTER_MIN_SIMILARITY:
+                    prefiltered[row_num] = {
+                        "match_percentage": int(similarity * 100),
+                        "improvements": ["Skipped: little overlap with your resume (TF-IDF prefilter)"],
+                        "referrals": [],
+                        "messages": [],
+                    }
+            jobs = [(row_num, jd_text) for row_num, jd_text in jobs if row_num not in prefiltered]
+            print(f"Prefilter: skipping {len(prefiltered)} low-overlap job(s)\n")
+
+    # --- Step 3b: Two-call mode scores JDs in batches too (resume sent once per call) ---
+    match_results = {}
+    if not config.FUSE_MATCH_AND_MESSAGES:
+        print("Scoring job descriptions...")
+        for start in range(0, len(jobs), config.JD_BATCH_SIZE):
+            batch = jobs[start:start + config.JD_BATCH_SIZE]
             try:
-                # Parse JD text
-                jd_data = jd_parser.parse_jd(jd_text)
-                job_title = jd_data.get("job_title", "Unknown")
-                company_name = jd_data.get("company_name", "Unknown")
-                print(f"  Role: {job_title} at {company_name}")
-
-                time.sleep(config.API_CALL_DELAY)
-
-                # Score match % + get improvements
-                match_result = matcher.match_resume_to_jd(resume_data, jd_data, jd_text)
-                match_pct = match_result.get("match_percentage", 0)
-                improvements = match_result.get("improvements", [])
-                print(f"  Match: {match_pct}%")
-
-                # Find referral profiles (uses Google, not Claude — no API delay needed)
-                referrals = referral_finder.find_referrals(company_name, job_title)
-                real_profiles = sum(1 for r in referrals if r["name"] != "Could not find profile")
-                print(f"  Found {real_profiles} referral profile(s)")
-
-                time.sleep(config.API_CALL_DELAY)
-
-                # Generate all messages in a single API call
-                messages = message_generator.generate_messages(referrals, resume_data, jd_data)
-                print(f"  Generated {len(messages)} message(s)")
-
-                # Write results to Excel (saves after each row)
-                results = {
-                    "match_percentage": match_pct,
-                    "improvements": improvements,
-                    "referrals": referrals,
-                    "messages": messages,
-                }
+                match_batch = matcher.match_resumes_to_jds(resume_data, [jd_text for _, jd_text in batch])
+            except ValueError:
+                # Some JD couldn't be scored: retry row by row so only that row fails
+                # (the JDs that were scored are cache hits)
+                match_batch = None
+            except Exception as e:
+                print(f"  ERROR scoring job descriptions: {e}")
+                failed.extend((row_num, f"Scoring failed: {e}") for row_num, _ in batch)
+                continue
+
+            if match_batch is None:
+                for row_num, jd_text in batch:
+                    try:
+                        match_results[row_num] = matcher.match_resume_to_jd(
+                            resume_data, parsed_jds[row_num], jd_text
+                        )
+                    except Exception as e:
+                        print(f"  ERROR scoring row {row_num}: {e}")
+                        failed.append((row_num, f"Scoring failed: {e}"))
+                continue
+            for (row_num, _), match_result in zip(batch, match_batch):
+                match_results[row_num] = match_result
+        jobs = [(row_num, jd_text) for row_num, jd_text in jobs if row_num in match_results]
+        print(f"  Scored {len(match_results)} job description(s)\n")
+
+    # --- Step 4: Process rows concurrently, writing results from this thread ---
+    print(f"Processing {len(jobs)} job(s), up to {config.MAX_CONCURRENT_JOBS} at a time...\n")
+
+    with excel_handler.TrackerWriter(flush_every=config.TRACKER_FLUSH_EVERY) as writer, \
+            ThreadPoolExecutor(max_workers=config.MAX_CONCURRENT_JOBS) as pool:
+        futures = {
+            pool.submit(
+                process_row, row_num, jd_text, parsed_jds[row_num], resume_data, match_results.get(row_num)
+            ): row_num
+            for row_num, jd_text in jobs
+        }
+
+        try:
+            for row_num, results in prefiltered.items():
+                jd_data = parsed_jds[row_num]
                 writer.write_results(row_num, results)
-                print(f"  Saved to Excel\n")
+                succeeded.append((
+                    row_num,
+                    jd_data.get("job_title", "Unknown"),
+                    jd_data.get("company_name", "Unknown"),
+                    results["match_percentage"],
+                ))
 
-                succeeded.append((row_num, job_title, company_name, match_pct))
+            for future in as_completed(futures):
+                row_num = futures[future]
+                jd_data = parsed_jds[row_num]
+                try:
+                    results = future.result()
 
-            except Exception as e:
-                print(f"  ERROR processing row {row_num}: {e}\n")
-                failed.append((row_num, str(e)))
+                    # Write results to Excel (saves every TRACKER_FLUSH_EVERY rows)
+                    writer.write_results(row_num, results)
+                    print(f"  Row {row_num}: saved to Excel")
+
+                    succeeded.append((
+                        row_num,
+                        jd_data.get("job_title", "Unknown"),
+                        jd_data.get("company_name", "Unknown"),
+                        results["match_percentage"],
+                    ))
+
+                except Exception as e:
+                    print(f"  ERROR processing row {row_num}: {e}")
+                    failed.append((row_num, str(e)))
+        except BaseException:
+            # Ctrl+C or a write error: drop the queued rows instead of running them
+            # all on the way out; the writer still saves the rows that finished
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    succeeded.sort()
+    failed.sort()
+    print()
 
-    # --- Step 4: Summary ---
+    # --- Step 5: Summary ---
     elapsed = time.time() - start_time
     print("=" * 60)
     print(f"Done! Processed {len(succeeded) + len(failed)} job(s) in {elapsed:.0f} seconds.")
@@ -1,17 +1,13 @@
 """Uses Claude API to score resume-JD match % and find improvement areas."""
 
-import claude_client
-
+import re
 
-def match_resume_to_jd(resume_data: dict, jd_data: dict, jd_text: str) -> dict:
-    """
-    Compare resume against job description and return match % and improvements.
-
-    Returns dict with: match_percentage (int), improvements (list of 3 strings).
-    """
-    resume_text = resume_data.get("raw_text", "")
+import claude_client
+import config
+import response_cache
 
-    prompt = f"""You are a job matching expert. Compare this resume against the job description and provide:
+# Scoring instructions, shared with the fused single-call path in orchestrator.py
+SCORING_RUBRIC = """Compare the resume against the job description and provide:
 
 1. A match percentage (0-100) based on:
    - Skills overlap (40% weight)
@@ -19,27 +15,108 @@ def match_resume_to_jd(resume_data: dict, jd_data: dict, jd_text: str) -> dict:
    - Project relevance (20% weight)
    - Education & certifications (15% weight)
 
-2. Exactly 3 specific, actionable areas where the candidate should improve to be a stronger fit for THIS specific role. Be concrete — mention specific skills, tools, or experiences to add.
+2. Exactly 3 specific, actionable areas where the candidate should improve to be a stronger fit for THIS specific role. Be concrete — mention specific skills, tools, or experiences to add. Number them "1. ", "2. ", "3. "."""
+
+_RUBRIC = f"""You are a job matching expert. {SCORING_RUBRIC}
+
+Submit your answer with the submit_match tool."""
+
+_BATCH_RUBRIC = f"""You are a job matching expert. The user message has one resume and several numbered job descriptions. For EACH job description, in order:
+
+{SCORING_RUBRIC}
 
-Return ONLY valid JSON:
-{{
-  "match_percentage": 74,
-  "improvements": [
-    "1. Add Docker containerization to your pipeline projects — this role explicitly requires Docker and your resume has no container experience",
-    "2. Learn dbt fundamentals and add a dbt project to your portfolio — the role requires dbt for data transformations and you currently have no dbt experience",
-    "3. Deepen your AWS skills beyond S3/Glue to include Redshift and Lambda — the role requires full AWS data stack proficiency"
-  ]
-}}
+Submit one result per job description, in order, with the submit_matches tool."""
 
-RESUME:
-{resume_text}
+# Output schema; Claude is forced to call this tool, so its input is the result.
+# The properties are also reused by the fused tool in orchestrator.py.
+MATCH_TOOL = {
+    "name": "submit_match",
+    "description": "Submit the resume/job match score and improvement areas.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "match_percentage": {"type": "integer", "minimum": 0, "maximum": 100},
+            "improvements": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": 3,
+                "maxItems": 3,
+            },
+        },
+        "required": ["match_percentage", "improvements"],
+    },
+}
 
-JOB DESCRIPTION:
-{jd_text}"""
 
-    result = claude_client.call_claude_json(prompt)
+_BATCH_TOOL = {
+    "name": "submit_matches",
+    "description": "Submit one match result per job description, in order.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "matches": {"type": "array", "items": MATCH_TOOL["input_schema"]},
+        },
+        "required": ["matches"],
+    },
+}
 
-    # Validate and normalize
+# Output budget per scored JD: one int + 3 improvement sentences is ~250 tokens
+MATCH_MAX_TOKENS = 400
+
+_MATCH_PCT_RE = re.compile(r'"match_percentage"\s*:\s*(\d+)')
+
+
+def stop_below_threshold(partial_json: str) -> dict | None:
+    """
+    Early-exit check for a streamed match: once match_percentage has arrived and
+    is below MIN_MATCH_PCT, return a short result (flagged below_threshold) so the
+    rest of the completion isn't waited for. Returns None to keep streaming.
+    """
+    m = _MATCH_PCT_RE.search(partial_json)
+    # The number may still be arriving ("7" of "74"), so wait for the next token
+    if m is None or m.end() == len(partial_json):
+        return None
+    match_pct = int(m.group(1))
+    if match_pct >= config.MIN_MATCH_PCT:
+        return None
+    return {"match_percentage": match_pct, "improvements": [], "below_threshold": True}
+
+
+def tfidf_similarities(resume_text: str, jd_texts: list[str]) -> list[float] | None:
+    """
+    Cosine similarity of each JD to the resume over TF-IDF vectors, as a cheap
+    local prefilter. The vocabulary is fit once over the resume plus all JDs.
+
+    Returns None if scikit-learn isn't installed.
+    """
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+    except ImportError:
+        return None
+
+    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
+    matrix = vectorizer.fit_transform([resume_text, *jd_texts])
+    return cosine_similarity(matrix[0], matrix[1:])[0].tolist()
+
+
+def needs_escalation(result: dict) -> bool:
+    """
+    Whether a fast-model score should be re-run on MODEL: the score is borderline
+    (inside MATCH_ESCALATE_RANGE) or the result is malformed.
+    """
+    match_pct = result.get("match_percentage")
+    if not isinstance(match_pct, int):
+        return True
+    low, high = config.MATCH_ESCALATE_RANGE
+    if low <= match_pct <= high:
+        return True
+    improvements = result.get("improvements")
+    return not result.get("below_threshold") and not (isinstance(improvements, list) and len(improvements) == 3)
+
+
+def normalize_match(result: dict) -> dict:
+    """Fill in missing fields and clamp match_percentage to 0-100."""
     if "match_percentage" not in result:
         result["match_percentage"] = 50
     if "improvements" not in result or len(result["improvements"]) < 3:
@@ -48,5 +125,147 @@ JOB DESCRIPTION:
             result["improvements"].append("Review the full job description for additional requirements")
 
     result["match_percentage"] = max(0, min(100, int(result["match_percentage"])))
+    return result
+
 
+def match_resume_to_jd(resume_data: dict, jd_data: dict, jd_text: str) -> dict:
+    """
+    Compare resume against job description and return match % and improvements.
+
+    Returns dict with: match_percentage (int), improvements (list of 3 strings).
+    """
+    resume_text = resume_data.get("raw_text", "")
+
+    cache_key = response_cache.make_cascade_key(_RUBRIC, resume_text, jd_text)
+    cached = response_cache.load("match", cache_key)
+    if cached is not None:
+        return cached
+
+    # Rubric (system) and resume (prefix) are identical for every JD in a run and are
+    # cached by the API; only the JD is new per call
+    request = dict(
+        prompt=f"JOB DESCRIPTION:\n{jd_text}",
+        tool=MATCH_TOOL,
+        max_tokens=MATCH_MAX_TOKENS,
+        cached_prefix=f"RESUME:\n{resume_text}\n",
+        system=_RUBRIC,
+        stop_when=stop_below_threshold if config.MIN_MATCH_PCT else None,
+    )
+    # Cheap first pass; only borderline or malformed scores go to the main model
+    result = claude_client.call_claude_tool_cascade(request, needs_escalation)
+    if result.get("below_threshold"):
+        # Stopped before the improvements were written, so there's nothing to cache
+        return result
+
+    result = normalize_match(result)
+
+    response_cache.store("match", cache_key, result)
     return result
+
+
+def _match_batch(resume_text: str, jd_texts: list[str], model: str) -> list[dict]:
+    """Score the resume against several JDs in one call; returns the raw result dicts."""
+    jd_blocks = "\n---\n".join(f"JD {i}:\n{jd_text}" for i, jd_text in enumerate(jd_texts, 1))
+    parsed = claude_client.call_claude_tool(
+        jd_blocks,
+        _BATCH_TOOL,
+        max_tokens=MATCH_MAX_TOKENS * len(jd_texts),
+        cached_prefix=f"RESUME:\n{resume_text}\n",
+        system=_BATCH_RUBRIC,
+        model=model,
+    ).get("matches")
+
+    if not isinstance(parsed, list) or len(parsed) != len(jd_texts):
+        raise ValueError(f"Expected {len(jd_texts)} match result(s) from Claude")
+
+    return [item if isinstance(item, dict) else {} for item in parsed]
+
+
+def _match_uncached(resume_text: str, jd_texts: list[str]) -> list[dict]:
+    """
+    Score the resume against several JDs and return the normalized results.
+
+    With FAST_MODEL set, the whole batch is scored by it first and only the
+    borderline or malformed results are re-scored, together, by MODEL. If that
+    reply comes back short, each JD is re-scored alone; ones that still fail are
+    None in the returned list.
+    """
+    results = [None] * len(jd_texts)
+    if config.FAST_MODEL:
+        try:
+            fast = _match_batch(resume_text, jd_texts, config.FAST_MODEL)
+            results = [None if needs_escalation(result) else result for result in fast]
+        except Exception:
+            pass  # escalate the whole batch, as call_claude_tool_cascade does
+
+    escalate = [i for i, result in enumerate(results) if result is None]
+    if escalate:
+        try:
+            rescored = _match_batch(resume_text, [jd_texts[i] for i in escalate], config.MODEL)
+        except ValueError:
+            if len(escalate) == 1:
+                raise
+            # Don't fail every escalated JD (and drop the fast results) over one bad reply
+            rescored = [_match_one(resume_text, jd_texts[i]) for i in escalate]
+        for i, result in zip(escalate, rescored):
+            results[i] = result
+
+    return [None if result is None else normalize_match(result) for result in results]
+
+
+def _match_one(resume_text: str, jd_text: str):
+    """Score one JD on MODEL via the batch tool; None if the reply is malformed."""
+    try:
+        return _match_batch(resume_text, [jd_text], config.MODEL)[0]
+    except ValueError:
+        return None
+
+
+def _batches(indices: list[int], jd_texts: list[str]):
+    """
+    Group JD indices so each call holds at most JD_BATCH_SIZE JDs and its JD text
+    stays within MATCH_BATCH_MAX_CHARS.
+    """
+    batch, size = [], 0
+    for i in indices:
+        if batch and (
+            len(batch) >= config.JD_BATCH_SIZE
+            or size + len(jd_texts[i]) > config.MATCH_BATCH_MAX_CHARS
+        ):
+            yield batch
+            batch, size = [], 0
+        batch.append(i)
+        size += len(jd_texts[i])
+    if batch:
+        yield batch
+
+
+def match_resumes_to_jds(resume_data: dict, jd_texts: list[str]) -> list[dict]:
+    """
+    Score the resume against several job descriptions, sending the resume once per call.
+
+    Results share the on-disk cache with match_resume_to_jd, so only unseen JDs are
+    sent to Claude; they spill into extra calls past JD_BATCH_SIZE JDs or
+    MATCH_BATCH_MAX_CHARS of JD text. Raises ValueError, after caching the rest,
+    if some JD could not be scored.
+    Returns one dict per JD, in order, with: match_percentage (int), improvements
+    (list of 3 strings).
+    """
+    resume_text = resume_data.get("raw_text", "")
+    keys = [response_cache.make_cascade_key(_RUBRIC, resume_text, jd_text) for jd_text in jd_texts]
+    results = [response_cache.load("match", key) for key in keys]
+
+    misses = [i for i, result in enumerate(results) if result is None]
+    failed = 0
+    for batch in _batches(misses, jd_texts):
+        matched = _match_uncached(resume_text, [jd_texts[i] for i in batch])
+        for i, result in zip(batch, matched):
+            if result is None:
+                failed += 1
+                continue
+            response_cache.store("match", keys[i], result)
+            results[i] = result
+
+    if failed:
+        raise ValueError(f"Could not score {failed} job description(s)")
+    return results
@@ -1,41 +1,72 @@
 """Generates contextual LinkedIn cold messages via Claude API."""
 
+import re
+
 import claude_client
+import response_cache
 
+# Static instructions, sent as the cached system prompt; per-call details go in the user message.
+# Also shared with the fused single-call path in orchestrator.py.
+MESSAGE_RULES = """Write LinkedIn connection request messages (max 280 characters EACH) from a job seeker to potential referral contacts.
 
-def generate_messages(
-    referrals: list[dict],
-    resume_data: dict,
-    jd_data: dict,
-) -> list[str]:
-    """
-    Generate personalized LinkedIn connection request messages for all referrals
-    in a single Claude API call.
+RULES:
+- Be specific and contextual — reference something concrete from the candidate's background that connects to the person's role/company
+- Do NOT be generic ("I'd love to connect" or "I'm reaching out because...")
+- Do NOT be needy or desperate
+- Be concise — this is a connection request, not a cover letter
+- Sound human, warm, and specific
+- End with a soft ask (learn about their experience, not "please refer me")"""
 
-    Args:
-        referrals: list of dicts with name, title, url, connection_type
-        resume_data: parsed resume dict
-        jd_data: parsed JD dict
+# Output schema; Claude is forced to call this tool, so its input is the result.
+MESSAGES_TOOL = {
+    "name": "submit_messages",
+    "description": "Submit one connection request message per person, in order.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "messages": {"type": "array", "items": {"type": "string", "maxLength": 280}},
+        },
+        "required": ["messages"],
+    },
+}
 
-    Returns:
-        List of message strings (one per referral, max ~280 chars each).
+
+# Phrases MESSAGE_RULES forbids; a fast-model draft containing one is rewritten by MODEL
+_BANNED_PHRASES_RE = re.compile(
+    r"\b(?:I'?d love to connect|I'?m reaching out because|(?:please )?refer me)\b", re.IGNORECASE
+)
+
+
+def needs_rewrite(generated: list[str], count: int) -> bool:
+    """Whether fast-model messages should be redone by MODEL: missing or rule-breaking."""
+    return len(generated) != count or any(_BANNED_PHRASES_RE.search(msg) for msg in generated)
+
+
+def messages_max_tokens(count: int) -> int:
+    """Output budget for `count` messages: ~70 tokens per 280-char message, plus JSON overhead."""
+    return 100 * count + 50
+
+
+def split_referrals(referrals: list[dict]) -> tuple[list[dict], list]:
+    """
+    Separate real profiles from fallback placeholders.
+
+    Returns (real_profiles, messages) where messages has one slot per referral:
+    a fixed note for placeholders and None for each real profile, in order.
     """
-    # Separate real profiles from fallback placeholders
     real_profiles = []
     messages = []
-    index_map = {}  # maps position in real_profiles -> position in referrals
-
-    for i, person in enumerate(referrals):
+    for person in referrals:
         if person.get("name") == "Could not find profile":
             messages.append("N/A — no profile found for this slot.")
         else:
-            index_map[len(real_profiles)] = i
             real_profiles.append(person)
             messages.append(None)  # placeholder
+    return real_profiles, messages
 
-    if not real_profiles:
-        return messages
 
+def build_details(real_profiles: list[dict], resume_data: dict, jd_data: dict) -> str:
+    """Build the per-call candidate, company, and people sections of the prompt."""
     top_skills = ", ".join(resume_data.get("skills", [])[:5])
     projects = resume_data.get("projects", [])
     most_relevant_project = projects[0] if projects else "data engineering pipeline project"
@@ -43,7 +74,6 @@ def generate_messages(
     job_title = jd_data.get("job_title", "Data Engineer")
     company_name = jd_data.get("company_name", "the company")
 
-    # Build a single prompt for all real profiles
     people_blocks = []
     for idx, person in enumerate(real_profiles, 1):
         people_blocks.append(
@@ -53,17 +83,7 @@ def generate_messages(
             f"- Connection type: {person['connection_type']}"
         )
 
-    prompt = f"""Write {len(real_profiles)} LinkedIn connection request message(s) (max 280 characters EACH) from a job seeker to potential referral contacts.
-
-RULES:
-- Be specific and contextual — reference something concrete from the candidate's background that connects to the person's role/company
-- Do NOT be generic ("I'd love to connect" or "I'm reaching out because...")
-- Do NOT be needy or desperate
-- Be concise — this is a connection request, not a cover letter
-- Sound human, warm, and specific
-- End with a soft ask (learn about their experience, not "please refer me")
-
-CANDIDATE PROFILE:
+    return f"""CANDIDATE PROFILE:
 - Name: Peter Pandey
 - Target role: {job_title} at {company_name}
 - Key skills: {top_skills}
@@ -74,31 +94,83 @@ COMPANY & ROLE:
 - Role: {job_title}
 - Key requirements: {top_requirements}
 
-{chr(10).join(people_blocks)}
-
-Return ONLY valid JSON — an array of {len(real_profiles)} message string(s), in order:
-["message for person 1", "message for person 2", ...]"""
-
-    try:
-        raw = claude_client.call_claude(prompt, max_tokens=512)
-        parsed = claude_client.extract_json(raw)
-
-        if isinstance(parsed, list):
-            for idx, msg in enumerate(parsed):
-                if idx < len(real_profiles):
-                    msg = str(msg).strip()
-                    if msg.startswith('"') and msg.endswith('"'):
-                        msg = msg[1:-1]
-                    if len(msg) > 280:
-                        msg = msg[:277] + "..."
-                    referral_idx = index_map[idx]
-                    messages[referral_idx] = msg
-    except Exception as e:
-        print(f"  Batch message generation failed, falling back to individual: {e}")
-
-    # Fill any remaining None slots (fallback for parse failures)
+{chr(10).join(people_blocks)}"""
+
+
+def clean_messages(parsed, count: int) -> list[str]:
+    """Normalize up to `count` generated messages: strip quotes, cap at 280 chars."""
+    if not isinstance(parsed, list):
+        return []
+    cleaned = []
+    for msg in parsed[:count]:
+        msg = str(msg).strip()
+        if msg.startswith('"') and msg.endswith('"'):
+            msg = msg[1:-1]
+        if len(msg) > 280:
+            msg = msg[:277] + "..."
+        cleaned.append(msg)
+    return cleaned
+
+
+def fill_messages(messages: list, generated: list[str]) -> list[str]:
+    """Fill the None slots from split_referrals with generated messages, in order."""
+    generated = iter(generated)
     for i, msg in enumerate(messages):
         if msg is None:
-            messages[i] = "[Message generation failed]"
-
+            # Anything left unfilled is a parse failure
+            messages[i] = next(generated, "[Message generation failed]")
     return messages
+
+
+def generate_messages(
+    referrals: list[dict],
+    resume_data: dict,
+    jd_data: dict,
+) -> list[str]:
+    """
+    Generate personalized LinkedIn connection request messages for all referrals
+    in a single Claude API call.
+
+    Args:
+        referrals: list of dicts with name, title, url, connection_type
+        resume_data: parsed resume dict
+        jd_data: parsed JD dict
+
+    Returns:
+        List of message strings (one per referral, max ~280 chars each).
+    """
+    real_profiles, messages = split_referrals(referrals)
+    if not real_profiles:
+        return messages
+
+    # Build a single prompt for all real profiles
+    prompt = f"""Write {len(real_profiles)} message(s), one per person, in order.
+
+{build_details(real_profiles, resume_data, jd_data)}"""
+
+    cache_key = response_cache.make_cascade_key(MESSAGE_RULES, prompt)
+    generated = response_cache.load("messages", cache_key)
+
+    if generated is None:
+        generated = []
+        try:
+            request = dict(
+                prompt=prompt,
+                tool=MESSAGES_TOOL,
+                max_tokens=messages_max_tokens(len(real_profiles)),
+                system=MESSAGE_RULES,
+            )
+            # Cheap first draft; only rewrite with the main model if it breaks the rules
+            parsed = claude_client.call_claude_tool_cascade(
+                request,
+                lambda parsed: needs_rewrite(
+                    clean_messages(parsed.get("messages"), len(real_profiles)), len(real_profiles)
+                ),
+            )
+            generated = clean_messages(parsed.get("messages"), len(real_profiles))
+            if len(generated) == len(real_profiles):
+                response_cache.store("messages", cache_key, generated)
+        except Exception as e:
+            print(f"  Batch message generation failed, falling back to individual: {e}")
+
+    return fill_messages(messages, generated)
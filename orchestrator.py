@@ -0,0 +1,105 @@
+"""Scores a job and writes its referral messages in a single Claude API call."""
+
+import claude_client
+import config
+import matcher
+import message_generator
+import response_cache
+
+# Static instructions for both tasks, sent as the cached system prompt
+_SYSTEM = f"""You are a job matching expert helping a job seeker. Do two tasks for the job below.
+
+TASK 1 — SCORE THE MATCH
+{matcher.SCORING_RUBRIC}
+
+TASK 2 — WRITE REFERRAL MESSAGES
+{message_generator.MESSAGE_RULES}
+
+Submit both results together with the submit_job tool."""
+
+# Union of the matcher and message generator output schemas
+_JOB_TOOL = {
+    "name": "submit_job",
+    "description": "Submit the match score, improvement areas, and referral messages.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            **matcher.MATCH_TOOL["input_schema"]["properties"],
+            **message_generator.MESSAGES_TOOL["input_schema"]["properties"],
+        },
+        "required": ["match_percentage", "improvements", "messages"],
+    },
+}
+
+
+def _needs_escalation(parsed: dict, message_count: int) -> bool:
+    """Whether a fast-model result should be redone by MODEL (see matcher / message_generator)."""
+    if matcher.needs_escalation(parsed):
+        return True
+    if parsed.get("below_threshold"):
+        return False  # no messages expected
+    messages = message_generator.clean_messages(parsed.get("messages"), message_count)
+    return message_generator.needs_rewrite(messages, message_count)
+
+
+def process_job(resume_data: dict, jd_data: dict, jd_text: str, referrals: list[dict]) -> dict:
+    """
+    Score the resume against a JD and generate messages for its referrals in one call.
+
+    Sends the resume and JD once instead of once per task. The separate
+    matcher.match_resume_to_jd / message_generator.generate_messages calls remain
+    for the non-fused path.
+
+    Returns dict with: match_percentage (int), improvements (list of 3 strings),
+    messages (one string per referral).
+    """
+    resume_text = resume_data.get("raw_text", "")
+    real_profiles, messages = message_generator.split_referrals(referrals)
+
+    if real_profiles:
+        task_2 = f"""Write {len(real_profiles)} message(s), one per person, in order.
+
+{message_generator.build_details(real_profiles, resume_data, jd_data)}"""
+    else:
+        task_2 = "No referral contacts were found — submit an empty messages array."
+    prompt = f"""JOB DESCRIPTION:
+{jd_text}
+
+{task_2}"""
+
+    cache_key = response_cache.make_cascade_key(_SYSTEM, resume_text, prompt)
+    result = response_cache.load("job", cache_key)
+
+    if result is None:
+        request = dict(
+            prompt=prompt,
+            tool=_JOB_TOOL,
+            max_tokens=matcher.MATCH_MAX_TOKENS + message_generator.messages_max_tokens(len(real_profiles)),
+            cached_prefix=f"RESUME:\n{resume_text}\n",
+            system=_SYSTEM,
+            stop_when=matcher.stop_below_threshold if config.MIN_MATCH_PCT else None,
+        )
+        # Cheap first pass; redo on the main model if the score is borderline or
+        # the result/messages are malformed
+        parsed = claude_client.call_claude_tool_cascade(
+            request, lambda parsed: _needs_escalation(parsed, len(real_profiles))
+        )
+        if parsed.get("below_threshold"):
+            # Low match: skip the improvements + messages the stream was cut before
+            return {
+                "match_percentage": parsed["match_percentage"],
+                "improvements": [],
+                "messages": [],
+            }
+        result = matcher.normalize_match({
+            key: parsed[key] for key in ("match_percentage", "improvements") if key in parsed
+        })
+        result["messages"] = message_generator.clean_messages(parsed.get("messages"), len(real_profiles))
+        if len(result["messages"]) == len(real_profiles):
+            response_cache.store("job", cache_key, result)
+
+    return {
+        "match_percentage": result["match_percentage"],
+        "improvements": result["improvements"],
+        "messages": message_generator.fill_messages(messages, result["messages"]),
+    }
@@ -1,12 +1,45 @@
 """Finds real LinkedIn profiles via SerpAPI (preferred) or Google search fallback."""
 
-import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import urllib.parse
-import urllib.request
+
+import httpx
+import orjson
 
 import config
+import response_cache
+
+_LINKEDIN_SUFFIX_RE = re.compile(r" [|-] LinkedIn")
+_NAME_RE = re.compile(r"^([A-Z][a-z]+ [A-Z][a-z]+)")
+
+# Shared SerpAPI client, so searches reuse keep-alive connections instead of a
+# new TLS handshake each time
+_serpapi_client = None
+_serpapi_client_lock = threading.Lock()
+
+
+def _get_serpapi_client() -> httpx.Client:
+    """Return the shared HTTP client for SerpAPI requests."""
+    global _serpapi_client
+    with _serpapi_client_lock:
+        if _serpapi_client is None:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            # With HTTP/2 the concurrent searches share one multiplexed connection
+            _serpapi_client = httpx.Client(
+                base_url="https://serpapi.com",
+                headers={"accept": "application/json"},
+                timeout=15,
+                http2=http2,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+            )
+    return _serpapi_client
 
 
 def _parse_linkedin_title(title: str, description: str = "") -> tuple[str, str]:
@@ -15,7 +48,7 @@ def _parse_linkedin_title(title: str, description: str = "") -> tuple[str, str]:
     person_title = ""
 
     if title:
-        title_clean = title.replace(" | LinkedIn", "").replace(" - LinkedIn", "")
+        title_clean = _LINKEDIN_SUFFIX_RE.sub("", title)
         parts = title_clean.split(" - ", 1)
         if len(parts) >= 2:
             name = parts[0].strip()
@@ -24,7 +57,7 @@ def _parse_linkedin_title(title: str, description: str = "") -> tuple[str, str]:
             name = parts[0].strip()
 
     if not name and description:
-        name_match = re.match(r"^([A-Z][a-z]+ [A-Z][a-z]+)", description)
+        name_match = _NAME_RE.match(description)
         if name_match:
             name = name_match.group(1)
 
@@ -34,21 +67,35 @@ def _parse_linkedin_title(title: str, description: str = "") -> tuple[str, str]:
     return name or "Unknown", person_title or "Professional"
 
 
+# Direct Google searches are spaced GOOGLE_SEARCH_PAUSE apart across all threads
+_google_lock = threading.Lock()
+_last_google_search = 0.0
+
+
+def _wait_for_google() -> None:
+    """Sleep until GOOGLE_SEARCH_PAUSE has passed since the previous Google search."""
+    global _last_google_search
+    with _google_lock:
+        wait = _last_google_search + config.GOOGLE_SEARCH_PAUSE - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_google_search = time.monotonic()
+
+
 def _search_serpapi(query: str, num_results: int = 5) -> list[dict]:
     """Search using SerpAPI (reliable, free tier: 100 searches/month)."""
     profiles = []
-    params = urllib.parse.urlencode({
+    params = {
         "q": query,
         "api_key": config.SERPAPI_API_KEY,
         "engine": "google",
         "num": num_results,
-    })
-    url = f"https://serpapi.com/search.json?{params}"
+    }
 
     try:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode())
+        resp = _get_serpapi_client().get("/search.json", params=params)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
 
         for result in data.get("organic_results", []):
             link = result.get("link", "")
@@ -76,6 +123,7 @@ def _search_google_fallback(query: str, num_results: int = 5) -> list[dict]:
     profiles = []
     try:
         from googlesearch import search
+        _wait_for_google()
         results = search(query, num_results=num_results, advanced=True)
         for result in results:
             url = result.url if hasattr(result, "url") else str(result)
@@ -100,10 +148,40 @@ def _search_google_fallback(query: str, num_results: int = 5) -> list[dict]:
 
 
 def _search(query: str, num_results: int = 5) -> list[dict]:
-    """Search using best available method."""
+    """
+    Search using best available method.
+
+    Results are cached on disk for REFERRAL_CACHE_TTL, so re-runs (and other roles
+    at the same company sharing a query) skip the network.
+    """
+    cache_key = response_cache.make_key(query, str(num_results), with_model=False)
+    profiles = response_cache.load("referrals", cache_key, max_age=config.REFERRAL_CACHE_TTL)
+    if profiles is not None:
+        return profiles
+
     if config.SERPAPI_API_KEY:
-        return _search_serpapi(query, num_results)
-    return _search_google_fallback(query, num_results)
+        profiles = _search_serpapi(query, num_results)
+    else:
+        profiles = _search_google_fallback(query, num_results)
+
+    # Empty results are usually errors or rate limiting, so try again next time
+    if profiles:
+        response_cache.store("referrals", cache_key, profiles)
+    return profiles
+
+
+def _search_with_retry(query: str) -> list[dict]:
+    """Run a search, waiting and retrying once if it gets rate limited."""
+    try:
+        return _search(query)
+    except Exception:
+        print(f"  Rate limited on search, waiting {config.GOOGLE_RATE_LIMIT_WAIT}s...")
+        time.sleep(config.GOOGLE_RATE_LIMIT_WAIT)
+        try:
+            return _search(query)
+        except Exception as e:
+            print(f"  Search still failing: {e}")
+            return []
 
 
 def find_referrals(company_name: str, job_title: str) -> list[dict]:
@@ -138,24 +216,13 @@ def find_referrals(company_name: str, job_title: str) -> list[dict]:
         },
     ]
 
-    for i, search_config in enumerate(searches):
-        if len(referrals) >= 3:
-            break
-
-        if i > 0:
-            time.sleep(config.GOOGLE_SEARCH_PAUSE)
-
-        try:
-            profiles = _search(search_config["query"])
-        except Exception:
-            print(f"  Rate limited on search {i + 1}, waiting {config.GOOGLE_RATE_LIMIT_WAIT}s...")
-            time.sleep(config.GOOGLE_RATE_LIMIT_WAIT)
-            try:
-                profiles = _search(search_config["query"])
-            except Exception as e:
-                print(f"  Search still failing: {e}")
-                profiles = []
+    # The searches are independent, so run them concurrently. SerpAPI does its own
+    # rate limiting; direct Google searches are spaced out by _wait_for_google.
+    with ThreadPoolExecutor(max_workers=len(searches)) as pool:
+        results = list(pool.map(_search_with_retry, [s["query"] for s in searches]))
 
+    # Take the first new profile from each search, in priority order
+    for search_config, profiles in zip(searches, results):
         for profile in profiles:
             if profile["url"] not in seen_urls:
                 profile["connection_type"] = search_config["connection_type"]
@@ -165,7 +232,6 @@ def find_referrals(company_name: str, job_title: str) -> list[dict]:
 
     # Broader fallback if we don't have 3
     if len(referrals) < 3:
-        time.sleep(config.GOOGLE_SEARCH_PAUSE)
         try:
             profiles = _search(f'site:linkedin.com/in "{company_name}" engineer', num_results=10)
             for profile in profiles:
@@ -0,0 +1,63 @@
+"""On-disk cache for Claude responses, keyed by a hash of the request inputs."""
+
+import hashlib
+import os
+import threading
+import time
+
+import orjson
+
+import config
+
+
+def make_key(*parts: str, with_model: bool = True) -> str:
+    """
+    Hash the given strings (plus the model name) into a cache key.
+
+    Pass with_model=False for results that don't come from Claude (e.g. searches),
+    so changing the model doesn't throw them away.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in ((config.MODEL,) if with_model else ()) + parts:
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def make_cascade_key(*parts: str) -> str:
+    """
+    make_key for results the FAST_MODEL -> MODEL cascade may have produced.
+
+    Also keyed on the fast model and the escalation range, so changing either
+    (or turning the cascade off) doesn't serve answers from the old setup.
+    """
+    return make_key(config.FAST_MODEL, repr(config.MATCH_ESCALATE_RANGE), *parts)
+
+
+def _path(namespace: str, key: str) -> str:
+    return os.path.join(config.CACHE_DIR, namespace, f"{key}.json")
+
+
+def load(namespace: str, key: str, max_age: float = None):
+    """
+    Return the cached value, or None on a miss (or unreadable entry).
+
+    With `max_age` (seconds), entries written longer ago than that count as misses.
+    """
+    try:
+        with open(_path(namespace, key), "rb") as f:
+            if max_age is not None and time.time() - os.fstat(f.fileno()).st_mtime > max_age:
+                return None
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def store(namespace: str, key: str, value) -> None:
+    """Write a value to the cache atomically (temp file + os.replace)."""
+    path = _path(namespace, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(value))
+    os.replace(tmp_path, path)
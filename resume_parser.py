@@ -1,70 +1,209 @@
 """Parses resume PDF into structured data with caching."""
 
-import json
+import contextlib
+import functools
+import hashlib
+import io
+import mmap
 import os
+import pickle
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 import config
 
+_EXPERIENCE_RES = [
+    re.compile(r"(\d+)\+?\s*years?\s*(?:of\s+)?experience", re.IGNORECASE),
+    re.compile(r"experience\s*:?\s*(\d+)\+?\s*years?", re.IGNORECASE),
+]
+_YEAR_RE = re.compile(r"20\d{2}")
+_EDUCATION_RES = [
+    re.compile(
+        r"(B\.?Tech|B\.?E\.?|B\.?S\.?|M\.?Tech|M\.?S\.?|M\.?E\.?|Ph\.?D\.?|MBA)[^,\n]*(?:in\s+)?[^,\n]*",
+        re.IGNORECASE,
+    ),
+    re.compile(r"(Bachelor|Master|Doctor)[^,\n]*", re.IGNORECASE),
+]
+# Lowercase line prefixes that start the projects section / any other section
+_PROJECTS_HEADER_PREFIXES = ("project", "personal project", "key project")
+_SECTION_HEADER_PREFIXES = ("experience", "education", "skills", "certification", "award")
+_PROJECT_NAME_SPLIT_RE = re.compile(r"\s*[|–—-]\s*")
+
+_MAX_TEXT_CHARS = 2000 * 4  # ~2000 tokens (rough estimate: 1 token ~ 4 chars)
+
+_SKILL_KEYWORDS = (
+    "Python", "SQL", "PySpark", "Spark", "Java", "Scala", "R",
+    "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#",
+    "Airflow", "Luigi", "Prefect", "Dagster",
+    "AWS", "GCP", "Azure", "S3", "EC2", "Lambda", "Glue", "Redshift",
+    "BigQuery", "Dataflow", "Cloud Functions",
+    "Snowflake", "Databricks", "dbt",
+    "Kafka", "RabbitMQ", "Kinesis", "Pub/Sub",
+    "Docker", "Kubernetes", "Terraform", "CI/CD",
+    "PostgreSQL", "MySQL", "MongoDB", "Cassandra", "DynamoDB", "Redis",
+    "Hadoop", "Hive", "MapReduce", "HDFS",
+    "Tableau", "Power BI", "Looker", "Metabase",
+    "Git", "GitHub", "GitLab", "Jira",
+    "ETL", "ELT", "Data Warehouse", "Data Lake",
+    "Machine Learning", "Deep Learning", "NLP", "TensorFlow", "PyTorch",
+    "Pandas", "NumPy", "Scikit-learn", "Matplotlib",
+    "REST", "GraphQL", "API", "Microservices",
+    "Linux", "Shell", "Bash",
+)
+
+_TOOL_KEYWORDS = (
+    "Airflow", "AWS S3", "Snowflake", "BigQuery", "Databricks",
+    "Docker", "Kubernetes", "Terraform", "Jenkins", "GitHub Actions",
+    "dbt", "Spark", "Kafka", "Tableau", "Power BI", "Looker",
+    "Jupyter", "VS Code", "IntelliJ", "DataGrip",
+    "Postman", "Swagger", "Grafana", "Prometheus",
+    "Celery", "Redis", "Elasticsearch", "Nginx",
+)
+
+
+_CERT_KEYWORDS = (
+    "certified", "certification", "certificate", "credential",
+    "AWS Certified", "Google Cloud", "Azure", "Databricks",
+    "Snowflake", "Confluent", "Coursera", "Udemy",
+)
+
+# Lowercased once for the substring-search fallbacks
+_SKILL_KEYWORDS_LOWER = tuple((skill.lower(), skill) for skill in _SKILL_KEYWORDS)
+_TOOL_KEYWORDS_LOWER = tuple((tool.lower(), tool) for tool in _TOOL_KEYWORDS)
+_CERT_KEYWORDS_LOWER = tuple(keyword.lower() for keyword in _CERT_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=1)
+def _keyword_automaton():
+    """
+    Build (once) an Aho-Corasick automaton over the skill, tool, and certification
+    keywords. Each lowercase keyword maps to its (category, keyword) entries, since
+    a keyword like "Snowflake" is in more than one list.
+    """
+    import ahocorasick
+
+    entries = {}
+    for category, keywords in (
+        ("skill", _SKILL_KEYWORDS), ("tool", _TOOL_KEYWORDS), ("cert", _CERT_KEYWORDS),
+    ):
+        for keyword in keywords:
+            entries.setdefault(keyword.lower(), []).append((category, keyword))
+
+    automaton = ahocorasick.Automaton()
+    for key, value in entries.items():
+        automaton.add_word(key, value)
+    automaton.make_automaton()
+    return automaton
+
+
+def _join_pages(page_texts) -> str:
+    """
+    Join page texts, stopping once there is comfortably more than _MAX_TEXT_CHARS
+    (the rest would be truncated away), so later pages are never parsed.
+    """
+    parts = []
+    total = 0
+    for page_text in page_texts:
+        if page_text:
+            parts.append(page_text)
+            total += len(page_text)
+            if total > _MAX_TEXT_CHARS * 2:
+                break
+    return "\n".join(parts).strip()
+
+
+@contextlib.contextmanager
+def _map_pdf(pdf_path: str):
+    """
+    Memory-map the PDF read-only and yield a memoryview of it, so hashing and
+    parsing read the kernel's pages directly instead of a copied bytes object.
+    """
+    with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+def _extract_text_pymupdf(pdf_data: memoryview) -> str:
+    """Extract page text with PyMuPDF (MuPDF C backend, much faster than pdfplumber)."""
+    import pymupdf
 
-def _extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract all text from a PDF file."""
+    with pymupdf.open(stream=pdf_data, filetype="pdf") as doc:
+        # MuPDF ends each page with a newline; trim it to match pdfplumber's output
+        return _join_pages(page.get_text("text").rstrip("\n") for page in doc)
+
+
+def _extract_text_pdfplumber(pdf_data: memoryview) -> str:
+    """Extract page text with pdfplumber."""
     import pdfplumber
 
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-    return text.strip()
+    with pdfplumber.open(io.BytesIO(pdf_data)) as pdf:
+        return _join_pages(page.extract_text() for page in pdf.pages)
+
+
+def _extract_text_from_pdf(pdf_data: memoryview) -> str:
+    """Extract all text from PDF file contents."""
+    if config.PDF_TEXT_BACKEND == "pymupdf":
+        try:
+            return _extract_text_pymupdf(pdf_data)
+        except ImportError:
+            pass
+    return _extract_text_pdfplumber(pdf_data)
+
+
+def _extract_keywords(text: str) -> tuple[list[str], list[str], list[str]]:
+    """
+    Extract skills, tools, and certification lines in a single pass over the text.
+
+    Uses one Aho-Corasick automaton for all three keyword lists when pyahocorasick
+    is installed, otherwise the separate extractors below.
+    """
+    try:
+        automaton = _keyword_automaton()
+    except ImportError:
+        return _extract_skills(text), _extract_tools(text), _extract_certifications(text)
+
+    text_lower = text.lower()
+    # Dicts as insertion-ordered sets: results come out in first-seen order, so the
+    # parsed resume (and prompts built from it) hash the same on every run
+    found = {"skill": {}, "tool": {}}
+    cert_line_numbers = {}
+    for end, entries in automaton.iter(text_lower):
+        for category, keyword in entries:
+            if category == "cert":
+                # Lowercasing never adds or removes newlines, so line numbers line up
+                cert_line_numbers[text_lower.count("\n", 0, end)] = None
+            else:
+                found[category][keyword] = None
+
+    lines = text.split("\n")
+    certs = dict.fromkeys(line for i in cert_line_numbers if len(line := lines[i].strip()) > 10)
+    return list(found["skill"]), list(found["tool"]), list(certs)
 
 
 def _extract_skills(text: str) -> list[str]:
     """Extract skills from resume text by looking for common skill patterns."""
-    skills = []
-    skill_keywords = [
-        "Python", "SQL", "PySpark", "Spark", "Java", "Scala", "R",
-        "JavaScript", "TypeScript", "Go", "Rust", "C++", "C#",
-        "Airflow", "Luigi", "Prefect", "Dagster",
-        "AWS", "GCP", "Azure", "S3", "EC2", "Lambda", "Glue", "Redshift",
-        "BigQuery", "Dataflow", "Cloud Functions",
-        "Snowflake", "Databricks", "dbt",
-        "Kafka", "RabbitMQ", "Kinesis", "Pub/Sub",
-        "Docker", "Kubernetes", "Terraform", "CI/CD",
-        "PostgreSQL", "MySQL", "MongoDB", "Cassandra", "DynamoDB", "Redis",
-        "Hadoop", "Hive", "MapReduce", "HDFS",
-        "Tableau", "Power BI", "Looker", "Metabase",
-        "Git", "GitHub", "GitLab", "Jira",
-        "ETL", "ELT", "Data Warehouse", "Data Lake",
-        "Machine Learning", "Deep Learning", "NLP", "TensorFlow", "PyTorch",
-        "Pandas", "NumPy", "Scikit-learn", "Matplotlib",
-        "REST", "GraphQL", "API", "Microservices",
-        "Linux", "Shell", "Bash",
-    ]
     text_lower = text.lower()
-    for skill in skill_keywords:
-        if skill.lower() in text_lower:
-            skills.append(skill)
-    return list(set(skills))
+    return list(dict.fromkeys(
+        skill for skill_lower, skill in _SKILL_KEYWORDS_LOWER if skill_lower in text_lower
+    ))
 
 
 def _extract_experience_years(text: str) -> str:
     """Estimate years of experience from resume text."""
-    patterns = [
-        r"(\d+)\+?\s*years?\s*(?:of\s+)?experience",
-        r"experience\s*:?\s*(\d+)\+?\s*years?",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _EXPERIENCE_RES:
+        match = pattern.search(text)
         if match:
             return match.group(1) + " years"
 
     # Look for date ranges in experience section to estimate
-    year_pattern = r"20\d{2}"
-    years = [int(y) for y in re.findall(year_pattern, text)]
+    # Matches are all 4-digit "20xx" strings, so they order the same as ints;
+    # only the min and max need converting
+    years = _YEAR_RE.findall(text)
     if years:
-        span = max(years) - min(years)
+        span = int(max(years)) - int(min(years))
         if span == 0:
             return "<1"
         return f"~{span} years"
@@ -73,12 +212,8 @@ def _extract_experience_years(text: str) -> str:
 
 def _extract_education(text: str) -> str:
     """Extract education information."""
-    edu_patterns = [
-        r"(B\.?Tech|B\.?E\.?|B\.?S\.?|M\.?Tech|M\.?S\.?|M\.?E\.?|Ph\.?D\.?|MBA)[^,\n]*(?:in\s+)?[^,\n]*",
-        r"(Bachelor|Master|Doctor)[^,\n]*",
-    ]
-    for pattern in edu_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _EDUCATION_RES:
+        match = pattern.search(text)
         if match:
             return match.group(0).strip()
     return ""
@@ -87,19 +222,14 @@ def _extract_education(text: str) -> str:
 def _extract_certifications(text: str) -> list[str]:
     """Extract certifications from resume text."""
     certs = []
-    cert_keywords = [
-        "certified", "certification", "certificate", "credential",
-        "AWS Certified", "Google Cloud", "Azure", "Databricks",
-        "Snowflake", "Confluent", "Coursera", "Udemy",
-    ]
-    lines = text.split("\n")
-    for line in lines:
-        line_lower = line.lower()
-        for keyword in cert_keywords:
-            if keyword.lower() in line_lower and len(line.strip()) > 10:
-                certs.append(line.strip())
-                break
-    return list(set(certs))
+    for line in text.split("\n"):
+        line_stripped = line.strip()
+        if len(line_stripped) <= 10:
+            continue
+        line_lower = line_stripped.lower()
+        if any(keyword in line_lower for keyword in _CERT_KEYWORDS_LOWER):
+            certs.append(line_stripped)
+    return list(dict.fromkeys(certs))
 
 
 def _extract_projects(text: str) -> list[str]:
@@ -109,16 +239,17 @@ def _extract_projects(text: str) -> list[str]:
     in_projects_section = False
     for line in lines:
         line_stripped = line.strip()
-        if re.match(r"(?:projects?|personal projects?|key projects?)", line_stripped, re.IGNORECASE):
+        line_lower = line_stripped.lower()
+        if line_lower.startswith(_PROJECTS_HEADER_PREFIXES):
             in_projects_section = True
             continue
         if in_projects_section:
-            if re.match(r"(?:experience|education|skills|certifications?|awards?)", line_stripped, re.IGNORECASE):
+            if line_lower.startswith(_SECTION_HEADER_PREFIXES):
                 in_projects_section = False
                 continue
             if line_stripped and len(line_stripped) > 5:
                 # Take the first part as project name (before any dash or pipe)
-                name = re.split(r"\s*[|–—-]\s*", line_stripped)[0].strip()
+                name = _PROJECT_NAME_SPLIT_RE.split(line_stripped)[0].strip()
                 if name and len(name) > 3:
                     projects.append(name)
     return projects[:10]  # Limit to 10 projects
@@ -126,73 +257,140 @@ def _extract_projects(text: str) -> list[str]:
 
 def _extract_tools(text: str) -> list[str]:
     """Extract tools/technologies mentioned in the resume."""
-    tools = [
-        "Airflow", "AWS S3", "Snowflake", "BigQuery", "Databricks",
-        "Docker", "Kubernetes", "Terraform", "Jenkins", "GitHub Actions",
-        "dbt", "Spark", "Kafka", "Tableau", "Power BI", "Looker",
-        "Jupyter", "VS Code", "IntelliJ", "DataGrip",
-        "Postman", "Swagger", "Grafana", "Prometheus",
-        "Celery", "Redis", "Elasticsearch", "Nginx",
-    ]
-    found = []
     text_lower = text.lower()
-    for tool in tools:
-        if tool.lower() in text_lower:
-            found.append(tool)
-    return list(set(found))
+    return list(dict.fromkeys(
+        tool for tool_lower, tool in _TOOL_KEYWORDS_LOWER if tool_lower in text_lower
+    ))
 
 
-def _truncate_text(text: str, max_tokens: int = 2000) -> str:
-    """Truncate text to approximately max_tokens (rough estimate: 1 token ~ 4 chars)."""
-    max_chars = max_tokens * 4
+def _truncate_text(text: str, max_chars: int = _MAX_TEXT_CHARS) -> str:
+    """Truncate text to max_chars, marking the cut."""
     if len(text) <= max_chars:
         return text
     return text[:max_chars] + "\n[... truncated for token efficiency ...]"
 
 
-def parse_resume(resume_path: str = None) -> dict:
-    """
-    Parse resume PDF and return structured data.
-    Uses caching to avoid re-parsing if PDF hasn't changed.
-    """
-    if resume_path is None:
-        resume_path = config.RESUME_PATH
+@functools.lru_cache(maxsize=1)
+def _load_cache(cache_path: str, cache_mtime: float) -> dict:
+    """Load the parsed-resume cache; memoized per file mtime so repeat calls skip disk."""
+    with open(cache_path, "rb") as f:
+        return pickle.load(f)
 
-    if not os.path.exists(resume_path):
-        raise FileNotFoundError(
-            f"Resume PDF not found at: {resume_path}\n"
-            f"Please place your resume PDF at this path."
-        )
 
-    cache_path = config.PARSED_RESUME_CACHE
-    pdf_mtime = os.path.getmtime(resume_path)
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write a file via temp file + os.replace, so a killed run never leaves it half-written."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
 
-    # Check cache
-    if os.path.exists(cache_path):
-        with open(cache_path, "r") as f:
-            cached = json.load(f)
-        if cached.get("_pdf_mtime") == pdf_mtime:
-            return cached
 
-    # Parse fresh
-    raw_text = _extract_text_from_pdf(resume_path)
+def _pdf_fingerprint(pdf_data: memoryview) -> str:
+    """
+    Content hash of the PDF, so edits are caught even when mtime is preserved
+    (e.g. rsync --times) and a touch alone doesn't force a re-parse.
+    """
+    return hashlib.blake2b(pdf_data, digest_size=32).hexdigest()
+
+
+def _parse_pdf_data(pdf_data: memoryview, resume_path: str) -> dict:
+    """Extract text from PDF contents and parse it into structured fields."""
+    raw_text = _extract_text_from_pdf(pdf_data)
     if not raw_text:
         raise ValueError(f"Could not extract text from resume PDF: {resume_path}")
 
-    parsed = {
+    # Extract from the same budget of text that is kept (and sent to Claude), so
+    # long resumes don't scan bytes that are thrown away
+    text = raw_text[:_MAX_TEXT_CHARS]
+    skills, tools, certifications = _extract_keywords(text)
+    return {
         "raw_text": _truncate_text(raw_text),
-        "skills": _extract_skills(raw_text),
-        "experience_years": _extract_experience_years(raw_text),
-        "education": _extract_education(raw_text),
-        "certifications": _extract_certifications(raw_text),
-        "projects": _extract_projects(raw_text),
-        "tools": _extract_tools(raw_text),
-        "_pdf_mtime": pdf_mtime,
+        "skills": skills,
+        "experience_years": _extract_experience_years(text),
+        "education": _extract_education(text),
+        "certifications": certifications,
+        "projects": _extract_projects(text),
+        "tools": tools,
     }
 
-    # Cache to disk
+
+def _parse_file(resume_path: str) -> dict:
+    """Parse one resume PDF without caching (module-level so worker processes can run it)."""
+    with _map_pdf(resume_path) as pdf_data:
+        return _parse_pdf_data(pdf_data, resume_path)
+
+
+def parse_resumes(resume_paths: list[str], max_workers: int = None) -> list[dict]:
+    """
+    Parse several resume PDFs in parallel, one worker process per CPU by default.
+
+    Text extraction is CPU-bound, so this uses processes rather than threads.
+    Results are not cached (the parsed-resume cache holds a single resume).
+    On platforms that spawn workers (Windows, macOS), call this from under
+    `if __name__ == "__main__":`.
+
+    Returns one dict per path, in order, with the same fields as parse_resume.
+    """
+    if len(resume_paths) <= 1:
+        return [_parse_file(path) for path in resume_paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_parse_file, resume_paths))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_resume_memo(resume_path: str, pdf_stat: tuple, cache_path: str) -> dict:
+    """
+    Body of parse_resume, memoized per PDF stat so a long-running process only
+    re-hashes the PDF when the file changes on disk.
+    """
+    fingerprint_path = cache_path + ".fingerprint"
+
+    # Map the PDF once for both the fingerprint and, on a cache miss, parsing
+    with _map_pdf(resume_path) as pdf_data:
+        fingerprint = _pdf_fingerprint(pdf_data)
+
+        # Check cache: the tiny sidecar says whether the cache is fresh, so a stale
+        # cache is never loaded just to be thrown away
+        try:
+            with open(fingerprint_path) as f:
+                fresh = f.read() == fingerprint
+        except OSError:
+            fresh = False
+        if fresh and os.path.exists(cache_path):
+            return _load_cache(cache_path, os.path.getmtime(cache_path))
+
+        # Parse fresh
+        parsed = _parse_pdf_data(pdf_data, resume_path)
+
+    # Cache to disk (internal file, so a binary format: no escaping of raw_text)
     os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    with open(cache_path, "w") as f:
-        json.dump(parsed, f, indent=2)
+    _write_atomic(cache_path, pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+    # Written last, so it only vouches for a complete cache file
+    _write_atomic(fingerprint_path, fingerprint.encode())
 
     return parsed
+
+
+def parse_resume(resume_path: str = None) -> dict:
+    """
+    Parse resume PDF and return structured data.
+    Uses caching to avoid re-parsing if PDF hasn't changed; repeat calls in the
+    same process cost one stat() while the file is untouched.
+    """
+    if resume_path is None:
+        resume_path = config.RESUME_PATH
+
+    try:
+        st = os.stat(resume_path)
+    except OSError:
+        raise FileNotFoundError(
+            f"Resume PDF not found at: {resume_path}\n"
+            f"Please place your resume PDF at this path."
+        ) from None
+
+    parsed = _parse_resume_memo(
+        resume_path, (st.st_ino, st.st_size, st.st_mtime_ns), config.PARSED_RESUME_CACHE
+    )
+    # The memoized dict is shared across calls; hand out a copy (lists included)
+    # so a caller editing its result can't change what later calls return
+    return {key: list(value) if isinstance(value, list) else value for key, value in parsed.items()}